@@ -1 +1 @@
-from .parser import EmailReplyParser, EmailMessage, EmailReply
+from .parser import EmailReplyParser, EmailMessage, EmailReply, precompile
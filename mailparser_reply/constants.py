@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Dict, Tuple
 
 #: Fallback language if no other language is specified
 MAIL_LANGUAGE_DEFAULT = 'en'
@@ -9,14 +9,27 @@ QUOTED_REGEX = r'(>+)'
 #: Regex to remove all leading quotations
 QUOTED_REMOVAL_REGEX = r'^(> *)'
 #: Allow to match within (multi)-quoted body
-#: e.g. allowing regex to match *inside* lines starting with "> > ..."
-QUOTED_MATCH_INCLUDE = r'(?:> ?)*'
+#: e.g. allowing regex to match *inside* lines starting with "> > ..."; bounded to keep
+#: the state space of the enclosing lazy patterns small (real mails rarely exceed a few levels)
+QUOTED_MATCH_INCLUDE = r'(?:> ?){0,32}'
 
+#: One or two lines of arbitrary text, e.g. a header's name and date wrapped by the mail client;
+#: same as `.+?\s?.+?`, but with only one way to match any input, so failing lines don't backtrack
+ONE_OR_TWO_LINES = r'.(?:.*?\n)??.+?'
+
+#: Characters and minimum length of an Outlook separator line; the hyphen has to stay last,
+#: as the characters are also used as a regex character class
+OUTLOOK_SEPARATOR_CHARACTERS, OUTLOOK_SEPARATOR_MIN_LENGTH = '_-', 32
 #: Outlook-style mail separator (32 underscores); also occasionally
-#: used within signatures
-OUTLOOK_MAIL_SEPARATOR = r'(\n{2,} ?[_-]{32,})'
+#: used within signatures. The _INCLUDE variant doesn't capture, for embedding into larger patterns
+OUTLOOK_MAIL_SEPARATOR_INCLUDE = rf'\n{{2,}} ?[{OUTLOOK_SEPARATOR_CHARACTERS}]{{{OUTLOOK_SEPARATOR_MIN_LENGTH},}}'
+OUTLOOK_MAIL_SEPARATOR = rf'({OUTLOOK_MAIL_SEPARATOR_INCLUDE})'
 #: Common mail separators (+ old Outlook separator)
 GENERIC_MAIL_SEPARATOR = r'^-{5,} ?Original Message ?-{5,}$'
+#: Casefolded literal every GENERIC_MAIL_SEPARATOR contains; cheap substring pre-filter
+GENERIC_MAIL_SEPARATOR_KEYWORD = 'original message'
+#: Every disclaimer has to mention "mail"; cheap substring pre-filter for the disclaimers regex
+DISCLAIMER_KEYWORD = 'mail'
 
 #: Outlook Signature defaults; line optionally starts with whitespace, contains two
 #: hyphens or underscores, and ends with optional whitespace.
@@ -27,20 +40,29 @@ DEFAULT_SIGNATURE_REGEX = rf'\s*^{QUOTED_MATCH_INCLUDE}(?:[-_]{{2}}\n|- ?\w).*'
 #: All kinds of whitespaces incl special characters; used for Disclaimers, because they
 #: are usually either added in post by a mailserver or scrambled due to their higher complexity.
 SINGLE_SPACE_VARIATIONS = r'[ \u200b\xA0\t]'
-#: Linebreaks ok too
-OPTIONAL_LINEBREAK = rf'[,()]?{SINGLE_SPACE_VARIATIONS}{{0,3}}[\n\r]?{SINGLE_SPACE_VARIATIONS}{{0,3}}[,()]?'
+#: Linebreaks ok too; up to six whitespaces, or up to three around a single linebreak. Split into two
+#: alternatives so whitespace-only gaps are matched by one tight loop instead of two competing ones
+OPTIONAL_LINEBREAK = (rf'[,()]?(?:{SINGLE_SPACE_VARIATIONS}{{0,3}}[\n\r]{SINGLE_SPACE_VARIATIONS}{{0,3}}'
+                      rf'|{SINGLE_SPACE_VARIATIONS}{{0,6}})[,()]?')
 #: Possible ways to check for linebreaks
 SENTENCE_START = rf'(?:[\n\r.!?]|^){SINGLE_SPACE_VARIATIONS}{{0,3}}'
 
+
+def _from_header(fields: str, min_lines: int = 2) -> str:
+    """ Builds an Outlook-style header regex matching at least `min_lines` consecutive
+     lines starting with one of the `|`-separated header `fields` """
+    return (r'((?:(?:^|\n|\n' + QUOTED_MATCH_INCLUDE + r')[* ]*(?:' + fields + r'):[ *]*(?:\s{0,2}).*)'
+            + f'{{{min_lines},}}' + r'(?:\n.*){0,1})')
+
+
 #: Matching regex for all languages
+#: plain-literal `sent_from`/`signatures` alternatives allow a cheap pre-filter; see parser.get_signature_keywords
 MAIL_LANGUAGES: Dict[str, Dict[str, str]] = {
     'de': {
         'wrote_header': r'^(?!Am.*Am\s.+?schrieb.*:)('
                         + QUOTED_MATCH_INCLUDE
-                        + r'Am\s(?:.+?\s?)schrieb\s(?:.+?\s?.+?):)$',
-        'from_header': r'((?:(?:^|\n|\n'
-                       + QUOTED_MATCH_INCLUDE
-                       + r')[* ]*(?:Von|Gesendet|An|Betreff|Datum|Cc|Organisation):[ *]*(?:\s{,2}).*){2,}(?:\n.*){,1})',
+                        + r'Am\s(?:.+?\s?)schrieb\s(?:' + ONE_OR_TWO_LINES + r'):)$',
+        'from_header': _from_header(r'Von|Gesendet|An|Betreff|Datum|Cc|Organisation'),
         'disclaimers': [
             r'(?:Wichtiger )?Hinweis:',
             'Achtung:',
@@ -54,20 +76,18 @@ MAIL_LANGUAGES: Dict[str, Dict[str, str]] = {
     },
     'en': {
         # Apple Mail-style header
-        # ^(?!On[.\s]*On\s(.+?\s?.+?)\swrote:) – Negative lookahead, see:
+        # ^(?!On[.\s]*On\s(<ONE_OR_TWO_LINES>)\swrote:) – Negative lookahead, see:
         #    https://github.com/github/email_reply_parser/pull/31
         # <QUOTED_MATCH_INCLUDE> – allow matching this inside quoted levels
-        # On\s(?:.+?\s?.+?)\swrote:) – match "On 01.01.2025, John Doe wrote:"
+        # On\s(?:<ONE_OR_TWO_LINES>)\s?wrote:) – match "On 01.01.2025, John Doe wrote:"
         #   See multiline_on.txt for example data
-        'wrote_header': r'^(?!On[.\s]*On\s(.+?\s?.+?)\swrote:)(' + QUOTED_MATCH_INCLUDE + r'On\s(?:.+?\s?.+?)\s?wrote:)$',
+        'wrote_header': r'^(?!On[.\s]*On\s(' + ONE_OR_TWO_LINES + r')\swrote:)(' + QUOTED_MATCH_INCLUDE + r'On\s(?:' + ONE_OR_TWO_LINES + r')\s?wrote:)$',
         # Outlook-style header
         # (?:(?:^|\n)[* ]*(?:From|Sent|To|Subject|Date|Cc):[ *]* – match From:/*From*:, ... headers
-        # (?:\s{,2}).*){2,} – allow multi-line headers; some clients split the headers up into multiple lines.
+        # (?:\s{0,2}).*){2,} – allow multi-line headers; some clients split the headers up into multiple lines.
         #       Also require at least two occurrences of the above pattern; e.g. From: ...\n Sent: ...
-        # (?:\n.*){,1} – allow optional subject or other broken multi-line at the end
-        'from_header': r'((?:(?:^|\n|\n'
-                       + QUOTED_MATCH_INCLUDE
-                       + r')[* ]*(?:From|Sent|To|Subject|Date|Cc|Organization):[ *]*(?:\s{,2}).*){2,}(?:\n.*){,1})',
+        # (?:\n.*){0,1} – allow optional subject or other broken multi-line at the end
+        'from_header': _from_header(r'From|Sent|To|Subject|Date|Cc|Organization'),
         'disclaimers': [
             'CAUTION:',
             'Disclaimer:',
@@ -92,24 +112,20 @@ MAIL_LANGUAGES: Dict[str, Dict[str, str]] = {
         'wrote_header': r'(?!Le.*Le\s.+?a \u00e9crit[a-zA-Z0-9.:;<>()&@ -]*:)('
                         + QUOTED_MATCH_INCLUDE
                         + r'Le\s(.+?)a \u00e9crit[a-zA-Z0-9.:;<>()&@ -]*:)',
-        'from_header': r'((?:(?:^|\n|\n'
-                       + QUOTED_MATCH_INCLUDE
-                       + r')[* ]*(?:De |Envoy\u00e9 |\u00C0 |Objet |  |Cc ):[ *]*(?:\s{,2}).*){2,}(?:\n.*){,1})',
+        'from_header': _from_header(r'De |Envoy\u00e9 |\u00C0 |Objet |  |Cc '),
         'signatures': [
             'cordialement',
             'salutations',
             r'bonne r[\u00e9e]ception',
             r'bonne journ[\u00e9e]e',
         ],
-        'sent_from': r'Envoy\u00e9 depuis',
+        'sent_from': 'Envoy\u00e9 depuis',
     },
     'it': {
-        'wrote_header': r'^(?!Il[.\s]*Il\s(.+?\s?.+?)\sha scritto:)('
+        'wrote_header': r'^(?!Il[.\s]*Il\s(' + ONE_OR_TWO_LINES + r')\sha scritto:)('
                         + QUOTED_MATCH_INCLUDE
-                        + r'Il\s(?:.+?\s?.+?)\s?ha scritto:)$',
-        'from_header': r'((?:(?:^|\n|\n'
-                       + QUOTED_MATCH_INCLUDE
-                       + r')[* ]*(?:Da|Inviato|A|Oggetto|Data|Cc):[ *]*(?:\s{,2}).*){2,}(?:\n.*){,1})',
+                        + r'Il\s(?:' + ONE_OR_TWO_LINES + r')\s?ha scritto:)$',
+        'from_header': _from_header(r'Da|Inviato|A|Oggetto|Data|Cc'),
         'signatures': [
             'Cordiali saluti',
         ],
@@ -119,20 +135,16 @@ MAIL_LANGUAGES: Dict[str, Dict[str, str]] = {
         'wrote_header': r'^(?!.*\d{4}年\d{1,2}月\d{1,2}日\(.\) \d{1,2}:\d{2}.+? <.+?>:.*\d{4}年\d{1,2}月\d{1,2}日\(.\) \d{1,2}:\d{2}.+? <.+?>:)('
                         + QUOTED_MATCH_INCLUDE
                         + r'\d{4}年\d{1,2}月\d{1,2}日\(.\) \d{1,2}:\d{2}.+? <.+?>):$',
-        'from_header': r'((?:(?:^|\n|\n'
-                       + QUOTED_MATCH_INCLUDE
-                       + r')[* ]*(?:From|Sent|To|Subject|Date|Cc):[ *]*(?:\s{,2}).*){2,}(?:\n.*){,1})',
+        'from_header': _from_header(r'From|Sent|To|Subject|Date|Cc'),
         'disclaimers': [],
         'signatures': [],
         'sent_from': '',
     },
     'nl': {
-        'wrote_header': r'^(?!Op[.\s]*Op\s(.+?\s?.+?)\sschreef:)('
+        'wrote_header': r'^(?!Op[.\s]*Op\s(' + ONE_OR_TWO_LINES + r')\sschreef:)('
                         + QUOTED_MATCH_INCLUDE
-                        + r'Op\s(?:.+?\s?.+?)\s?schreef:)$',
-        'from_header': r'((?:(?:^|\n|\n'
-                       + QUOTED_MATCH_INCLUDE
-                       + r')[* ]*(?:Van|Verzonden|Aan|Onderwerp|Datum|Cc):[ *]*(?:\s{,2}).*){2,}(?:\n.*){,1})',
+                        + r'Op\s(?:' + ONE_OR_TWO_LINES + r')\s?schreef:)$',
+        'from_header': _from_header(r'Van|Verzonden|Aan|Onderwerp|Datum|Cc'),
         'disclaimers': [
             'Disclaimer:',
             'Waarschuwing:',
@@ -146,12 +158,10 @@ MAIL_LANGUAGES: Dict[str, Dict[str, str]] = {
         'sent_from': 'Verzonden vanaf mijn',
     },
     'pl': {
-        'wrote_header': r'^(?!Dnia[.\s]*Dnia\s(.+?\s?.+?)\s(?:nadesłał|napisał\(a\)):)('
+        'wrote_header': r'^(?!Dnia[.\s]*Dnia\s(' + ONE_OR_TWO_LINES + r')\s(?:nadesłał|napisał\(a\)):)('
                         + QUOTED_MATCH_INCLUDE
-                        + r'Dnia\s(?:.+?\s?.+?)\s?(?:nadesłał|napisał\(a\)):)$',
-        'from_header': r'((?:(?:^|\n|\n'
-                       + QUOTED_MATCH_INCLUDE
-                       + r')[* ]*(?:Od|Wysłano|Do|Temat|Data|DW):[ *]*(?:\s{,2}).*){1,}(?:\n.*){,1})',
+                        + r'Dnia\s(?:' + ONE_OR_TWO_LINES + r')\s?(?:nadesłał|napisał\(a\)):)$',
+        'from_header': _from_header(r'Od|Wysłano|Do|Temat|Data|DW', min_lines=1),
         'disclaimers': [
             'Uwaga:'
         ],
@@ -165,9 +175,36 @@ MAIL_LANGUAGES: Dict[str, Dict[str, str]] = {
     },
     'david': {
         # Custom Software Headers – also kind of like a language, right?
-        'from_header': r'((?:^ *' + QUOTED_MATCH_INCLUDE + r'\[?Original Message processed by david.+?$\n{,4})'
-                       + r'(?:.*\n?){,2}'  # david's non-subject line + date wildcard identification
+        'from_header': r'((?:^ *' + QUOTED_MATCH_INCLUDE + r'\[?Original Message processed by david.+?$\n{0,4})'
+                       + r'(?:.*\n?){0,2}'  # david's non-subject line + date wildcard identification
                        + r'(?:(?:^|\n|\n'
-                       + QUOTED_MATCH_INCLUDE + r')[* ]*(?:Von|An|Cc)(?:\s{,2}).*){2,})'
+                       + QUOTED_MATCH_INCLUDE + r')[* ]*(?:Von|An|Cc)(?:\s{0,2}).*){2,})'
     },
 }
+
+
+#: Casefolded keywords of which every `wrote_header` ("On ... wrote:") of a language contains one;
+#: a line can only be such a header if the text contains one of them
+WROTE_HEADER_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    'de': ('schrieb',),
+    'en': ('wrote:',),
+    'fr': ('a \u00e9crit',),
+    'it': ('ha scritto:',),
+    'ja': ('\u5e74',),  # 年
+    'nl': ('schreef:',),
+    'pl': ('nades\u0142a\u0142:', 'napisa\u0142(a):'),
+}
+
+
+#: Casefolded keywords of the Outlook-style `from_header` per language; a cheap substring pre-filter
+#: as the (expensive) header regex can only match if at least one of them is contained in the text
+HEADER_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    'de': ('von:', 'gesendet:', 'an:', 'betreff:', 'datum:', 'cc:', 'organisation:'),
+    'en': ('from:', 'sent:', 'to:', 'subject:', 'date:', 'cc:', 'organization:'),
+    'fr': ('de :', 'envoy\u00e9 :', '\u00e0 :', 'objet :', '  :', 'cc :'),
+    'it': ('da:', 'inviato:', 'a:', 'oggetto:', 'data:', 'cc:'),
+    'ja': ('from:', 'sent:', 'to:', 'subject:', 'date:', 'cc:'),
+    'nl': ('van:', 'verzonden:', 'aan:', 'onderwerp:', 'datum:', 'cc:'),
+    'pl': ('od:', 'wysłano:', 'do:', 'temat:', 'data:', 'dw:'),
+    'david': ('original message processed by david',),
+}
@@ -2,18 +2,202 @@
 
 import logging
 import re
+import sys
 from dataclasses import dataclass, field
-from itertools import chain
-from typing import Union, List, Optional, Tuple
+from functools import lru_cache, partial
+from typing import Dict, Iterable, Iterator, Union, List, Optional, Tuple
 
-from typing import Pattern
+from typing import Match, Pattern
 
-from .constants import MAIL_LANGUAGES, MAIL_LANGUAGE_DEFAULT, OUTLOOK_MAIL_SEPARATOR, QUOTED_REMOVAL_REGEX, \
+from .constants import MAIL_LANGUAGES, MAIL_LANGUAGE_DEFAULT, OUTLOOK_MAIL_SEPARATOR_INCLUDE, \
+    OUTLOOK_SEPARATOR_CHARACTERS, OUTLOOK_SEPARATOR_MIN_LENGTH, \
     SINGLE_SPACE_VARIATIONS, SENTENCE_START, OPTIONAL_LINEBREAK, DEFAULT_SIGNATURE_REGEX, QUOTED_MATCH_INCLUDE, \
-    GENERIC_MAIL_SEPARATOR
+    GENERIC_MAIL_SEPARATOR, GENERIC_MAIL_SEPARATOR_KEYWORD, DISCLAIMER_KEYWORD, HEADER_KEYWORDS, WROTE_HEADER_KEYWORDS
 
 logger = logging.getLogger(__name__)
 
+#: MAIL_LANGUAGES with list-valued entries joined into a single alternation once at import
+_JOINED_LANGUAGES: Dict[str, Dict[str, str]] = {
+    language: {
+        regex_key: '|'.join(pattern) if isinstance(pattern, list) else pattern
+        for regex_key, pattern in regexes.items()
+    }
+    for language, regexes in MAIL_LANGUAGES.items()
+}
+
+
+def _casefold(text: str) -> str:
+    """ Casefolds text for substring pre-filters; also maps the dotted/dotless i, which
+     re.IGNORECASE matches to "i" but str.casefold does not """
+    casefolded = text.casefold()
+    if text.isascii(): return casefolded
+    return casefolded.replace('i\u0307', 'i').replace('\u0131', 'i')
+
+
+def _atomic(pattern: str) -> str:
+    """ Wraps a language's alternation in an atomic group (Python 3.11+), so once one of its
+     alternatives matched, the engine doesn't backtrack into the other alternatives anymore """
+    if not pattern or sys.version_info < (3, 11): return pattern
+    return f'(?>{pattern})'
+
+
+@lru_cache(maxsize=256)
+def _get_language_regex(language: str, regex_key: str, languages: Tuple[str, ...], default_language: str,
+                        atomic: bool = True) -> str:
+    """ Returns the language-specific regex pattern; if no pattern is available
+     for the language it falls back to the default_language's regex. Cached, as MAIL_LANGUAGES is static """
+    if regex_key in _JOINED_LANGUAGES.get(language, {}):
+        pattern = _JOINED_LANGUAGES[language][regex_key]
+    elif default_language in languages:
+        return ''
+    else:
+        # Fallback; language does not have regex_key defined; use global fallback language's regex key
+        pattern = _JOINED_LANGUAGES[default_language][regex_key]
+    return _atomic(pattern) if atomic else pattern
+
+
+#: Dataclass decorator for the per-mail objects; slotted (no per-instance __dict__) on Python 3.10+
+_slotted_dataclass = partial(dataclass, slots=True) if sys.version_info >= (3, 10) else dataclass
+#: Characters with a special meaning in regexes; alternatives without them are plain literals
+_REGEX_SPECIAL_CHARACTERS = frozenset('\\.^$*+?{}[]()|')
+
+
+@lru_cache(maxsize=64)
+def get_disclaimers_regex(languages: Tuple[str, ...], default_language: str = MAIL_LANGUAGE_DEFAULT) -> Pattern:
+    """ Compile regex to remove disclaimers at the end of the mail; cached per language combination """
+    ALLOW_ANY_EXTENSION = r'[a-zA-Z0-9\u00C0-\u017F:;.,?!<>()@&/\'\"\“\” \u200b\xA0\t\-]*'
+    disclaimers = [_get_language_regex(language, 'disclaimers', languages, default_language) for language in languages]
+    disclaimers = '|'.join([
+        disclaimer for disclaimer in disclaimers if disclaimer
+    ]).replace(' ', SINGLE_SPACE_VARIATIONS)
+
+    disclaimers_regex = re.compile(
+        f'{SENTENCE_START}(?:{disclaimers})(?:{OPTIONAL_LINEBREAK}{ALLOW_ANY_EXTENSION}?(?:{DISCLAIMER_KEYWORD}){ALLOW_ANY_EXTENSION}){{1,2}}',
+        flags=re.MULTILINE | re.IGNORECASE
+    )
+    logger.debug(f'Mail Disclaimer RegEx: "{disclaimers_regex.pattern!r}"')
+    return disclaimers_regex
+
+
+def _header_patterns(languages: Tuple[str, ...],
+                     default_language: str) -> List[Tuple[Optional[Tuple[str, ...]], str]]:
+    """ The alternatives of the header regex in matching order, each with the casefolded keywords
+     of which at least one has to occur in a text for the alternative to match; None if there are none """
+    patterns = []
+    for regex_key, keywords in (('wrote_header', WROTE_HEADER_KEYWORDS), ('from_header', HEADER_KEYWORDS)):
+        for language in languages:
+            pattern = _get_language_regex(language, regex_key, languages, default_language)
+            # Languages without own patterns fall back to the default language's
+            if pattern: patterns.append((keywords.get(language) or keywords.get(default_language), pattern))
+    patterns.append(((GENERIC_MAIL_SEPARATOR_KEYWORD,), f'({GENERIC_MAIL_SEPARATOR})'))
+    return patterns
+
+
+@lru_cache(maxsize=64)
+def get_header_regex(languages: Tuple[str, ...], default_language: str = MAIL_LANGUAGE_DEFAULT) -> Pattern:
+    """ Builds the regex used for detecting headers; cached per language combination """
+    regex_headers = '|'.join([pattern for _, pattern in _header_patterns(languages, default_language)])
+    header_regex = re.compile(regex_headers, flags=re.MULTILINE | re.IGNORECASE)
+    logger.debug(f'Mail Header RegEx: "{header_regex.pattern!r}"')
+    return header_regex
+
+
+@lru_cache(maxsize=64)
+def get_header_regexes(languages: Tuple[str, ...], default_language: str = MAIL_LANGUAGE_DEFAULT
+                       ) -> Tuple[Tuple[Optional[Tuple[str, ...]], Pattern], ...]:
+    """ The alternatives of get_header_regex compiled one by one, each with its keywords; cached per
+     language combination. Lets a mail skip the (costly) alternatives whose keywords it doesn't contain """
+    return tuple(
+        (keywords, re.compile(pattern, flags=re.MULTILINE | re.IGNORECASE))
+        for keywords, pattern in _header_patterns(languages, default_language)
+    )
+
+
+def _finditer_alternatives(regexes: List[Pattern], text: str) -> Iterator[Match]:
+    """ Yields the matches `re.finditer` would yield for the alternation of the regexes, in matching order:
+     the leftmost match wins, and of matches starting at the same position the one of the earlier regex.
+     None of the regexes may match the empty string """
+    pending = [regex.search(text) for regex in regexes]
+    while any(pending):
+        start = min(match.start() for match in pending if match)
+        match = next(match for match in pending if match and match.start() == start)
+        yield match
+        end = match.end()
+        # Matches starting before the end overlap the yielded one; look for the next one of that regex
+        pending = [
+            regex.search(text, end) if pending_match and pending_match.start() < end else pending_match
+            for regex, pending_match in zip(regexes, pending)
+        ]
+
+
+@lru_cache(maxsize=64)
+def get_signature_regex(languages: Tuple[str, ...], default_language: str = MAIL_LANGUAGE_DEFAULT) -> Pattern:
+    """ Builds the regex used for detecting signatures; cached per language combination """
+    sent_from_regex = [_get_language_regex(language, 'sent_from', languages, default_language) for language in languages]
+    sent_from_regex = '|'.join([header for header in sent_from_regex if header])
+    signatures = [_get_language_regex(language, 'signatures', languages, default_language) for language in languages]
+    signatures = '|'.join([header for header in signatures if header])
+
+    # Matches the following signatures – when a signature is matched it's considered to move all the way
+    # until the end of the mail body. Might be dangerous; but honestly how github/email_reply_parser works too
+    #   1) Outlook-style signatures
+    #   2) Idiot-filter phone email_reply_parser "Sent from my ..." (usually 1-3 words)
+    #   3) Get Outlook for... / Sent from Outlook for iOS<https://greed.com">
+    #   4) Regular signature-indicating stuff; e.g. "Best regards, ..."
+    # TODO: Add quotation as optional matching
+    # 2) + 3) are left out if no language has "Sent from" signatures; an empty alternation would match any line
+    # Only the whole match is used, so nothing is captured
+    sent_from_signature = fr'\s*^{QUOTED_MATCH_INCLUDE}(?:{sent_from_regex}) ?(?:(?:[\w.<>:// ]+)|(?:\w+ ){{1,3}})$|'
+    signature_regex = re.compile(
+        fr'(?:{DEFAULT_SIGNATURE_REGEX}|{OUTLOOK_MAIL_SEPARATOR_INCLUDE}|' +   # 1)
+        (sent_from_signature if sent_from_regex else '') +  # 2) + 3)
+        fr'(?<!\A)^{QUOTED_MATCH_INCLUDE}(?:{signatures}))[\s\S]*',  # 4)
+        flags=re.MULTILINE | re.IGNORECASE
+    )
+    logger.debug(f'Mail Signature RegEx: "{signature_regex.pattern!r}"')
+
+    # TODO: Always match whole signature until the next fragment/regex or until end of text
+    return signature_regex
+
+
+@lru_cache(maxsize=64)
+def get_signature_keywords(languages: Tuple[str, ...],
+                           default_language: str = MAIL_LANGUAGE_DEFAULT) -> Optional[Tuple[str, ...]]:
+    """ Casefolded substrings of which at least one must occur for get_signature_regex to match;
+     None if a signature alternative isn't a plain literal and no such guarantee can be given """
+    # Outlook-style signatures and separators always contain a hyphen or underscore
+    keywords = ['-', '_']
+    for regex_key in ('sent_from', 'signatures'):
+        patterns = [_get_language_regex(language, regex_key, languages, default_language, atomic=False) for language in languages]
+        patterns = '|'.join([pattern for pattern in patterns if pattern])
+        # An empty signature alternation matches any line; "Sent from" is left out of the regex instead
+        if not patterns and regex_key == 'signatures': return None
+        for alternative in filter(None, patterns.split('|')):
+            if _REGEX_SPECIAL_CHARACTERS.intersection(alternative): return None
+            keywords.append(_casefold(alternative))
+    return tuple(keywords)
+
+
+def precompile(languages: Tuple[str, ...] = (MAIL_LANGUAGE_DEFAULT,), default_language: str = MAIL_LANGUAGE_DEFAULT):
+    """ Warms the regex caches for a language combination, so the first parsed mail
+     is as fast as the following ones; e.g. call at application startup """
+    languages = tuple(languages)
+    get_header_regexes(languages, default_language)
+    get_disclaimers_regex(languages, default_language)
+    get_signature_regex(languages, default_language)
+    get_signature_keywords(languages, default_language)
+
+
+def _precompile_reading(languages: Tuple[str, ...]):
+    """ Warms the regex caches EmailReplyParser.read uses; EmailMessage adds English and reads
+     with the global default language """
+    precompile(languages + (() if 'en' in languages else ('en',)), MAIL_LANGUAGE_DEFAULT)
+
+
+# The default language is by far the most common; compile its regexes once at import (~3ms).
+# EmailMessage(languages=['en']) and EmailReplyParser() read with exactly these cache entries
+precompile()
+
 
 @dataclass
 class EmailReplyParser:
@@ -22,23 +206,51 @@ class EmailReplyParser:
     default_language: str = MAIL_LANGUAGE_DEFAULT
 
     def __post_init__(self):
-        self.languages = [language.lower().strip() for language in self.languages]
+        # Interned, so lookups in the language dicts and regex caches compare by identity
+        self.languages = [sys.intern(language.lower().strip()) for language in self.languages]
         self.languages = [language for language in self.languages if language in MAIL_LANGUAGES]
         if not self.languages:
             self.languages = [self.default_language]
+        _precompile_reading(tuple(self.languages))
+
+    @classmethod
+    def for_languages(cls, languages: Tuple[str, ...] = (MAIL_LANGUAGE_DEFAULT,),
+                      default_language: str = MAIL_LANGUAGE_DEFAULT) -> 'EmailReplyParser':
+        """ Returns a shared parser instance for the language combination, e.g. for batch processing
+         where constructing a parser per mail would repeat the language setup """
+        return _shared_parser(cls, tuple(languages), default_language)
 
     def read(self, text: str) -> 'EmailMessage':
         """ Factory method that splits email into list of fragments
             text - A string email body"""
         return EmailMessage(text=text, languages=self.languages).read()
 
+    def read_many(self, texts: Iterable[str], workers: Optional[int] = None) -> List['EmailMessage']:
+        """ Parses multiple email bodies with the same languages, e.g. a whole mailbox
+            texts - An iterable of string email bodies
+            workers - Parse in this many processes; worth it for large batches only (default: in-process) """
+        if workers is None:
+            read = self.read
+            return [read(text) for text in texts]
+        # Imported here; it loads multiprocessing, which would make importing this module markedly slower
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers, initializer=_precompile_reading,
+                                 initargs=(tuple(self.languages),)) as executor:
+            return list(executor.map(self.read, texts, chunksize=32))
+
     def parse_reply(self, text: str) -> Union[str, None]:
         """ Provides the latest reply portion of email.
         text - A string email body """
         return self.read(text).latest_reply
 
 
-@dataclass
+@lru_cache(maxsize=64)
+def _shared_parser(cls: type, languages: Tuple[str, ...], default_language: str) -> EmailReplyParser:
+    """ Backs EmailReplyParser.for_languages; language order is kept as it decides which pattern wins """
+    return cls(languages=list(languages), default_language=default_language)
+
+
+@_slotted_dataclass
 class EmailMessage:
     """ An email message represents a parsed email body. """
 
@@ -61,9 +273,7 @@ class EmailMessage:
 
     #: Fallback language when other languages don't have dict entry
     default_language: str = MAIL_LANGUAGE_DEFAULT
-    _header_regex: Union[Pattern, None] = None
-    _disclaimers_regex: Union[Pattern, None] = None
-    _signature_regex: Union[Pattern, None] = None
+    _casefolded_text: Union[str, None] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         if self.include_english and 'en' not in self.languages:
@@ -82,127 +292,121 @@ class EmailMessage:
         if not self.replies: return None
         return self.replies[0].content
 
-    def _get_language_regex(self, language: str, regex_key: str) -> str:
-        """ Returns the language-specific regex pattern; if no pattern is available
-         for the language it falls back to the default_language's regex """
-        flat_list = lambda x: '|'.join(chain(x)) if isinstance(x, list) else x
+    @property
+    def casefolded_text(self) -> str:
+        """ Casefolded copy of the text used for keyword pre-filters; computed once per message """
+        if self._casefolded_text is None:
+            self._casefolded_text = _casefold(self.text)
+        return self._casefolded_text
 
-        if language in MAIL_LANGUAGES.keys():
-            if regex_key in MAIL_LANGUAGES[language].keys():
-                return flat_list(MAIL_LANGUAGES[language][regex_key])
-
-        if self.default_language in self.languages: return ''
-        # Fallback; language does not have regex_key defined; use global fallback language's regex key
-        return flat_list(MAIL_LANGUAGES[self.default_language][regex_key])
+    def _contains_any(self, keywords: Tuple[str, ...]) -> bool:
+        """ Cheap substring pre-filter checking whether any of the casefolded keywords is in the text """
+        return any(keyword in self.casefolded_text for keyword in keywords)
 
     @property
     def DISCLAIMERS_REGEX(self) -> Pattern:
         """ Compile regex to remove disclaimers at the end of the mail """
-        if self._disclaimers_regex: return self._disclaimers_regex
-
-        ALLOW_ANY_EXTENSION = r'[a-zA-Z0-9\u00C0-\u017F:;.,?!<>()@&/\'\"\“\” \u200b\xA0\t\-]*'
-        disclaimers = [self._get_language_regex(language=language, regex_key='disclaimers') for language in self.languages]
-        disclaimers = '|'.join([
-            disclaimer for disclaimer in disclaimers if disclaimer
-        ]).replace(' ', SINGLE_SPACE_VARIATIONS)
-
-        self._disclaimers_regex = re.compile(
-            f'{SENTENCE_START}(?:{disclaimers})(?:{OPTIONAL_LINEBREAK}{ALLOW_ANY_EXTENSION}?(?:mail){ALLOW_ANY_EXTENSION}){{1,2}}',
-            flags=re.MULTILINE | re.IGNORECASE
-        )
-        logger.debug(f'Mail Disclaimer RegEx: "{self._disclaimers_regex.pattern!r}"')
-        return self._disclaimers_regex
+        return get_disclaimers_regex(tuple(self.languages), self.default_language)
 
     @property
     def HEADER_REGEX(self) -> Pattern:
         """ Helper function to build the regex used for detecting headers  """
-        if self._header_regex: return self._header_regex
-        regex_headers = [self._get_language_regex(language=language, regex_key='wrote_header') for language in self.languages]
-        regex_headers += [self._get_language_regex(language=language, regex_key='from_header') for language in self.languages]
-        regex_headers.append(f'({GENERIC_MAIL_SEPARATOR})')
-        regex_headers = '|'.join([header for header in regex_headers if header])
-        self._header_regex = re.compile(regex_headers, flags=re.MULTILINE | re.IGNORECASE)
-        logger.debug(f'Mail Header RegEx: "{self._header_regex.pattern!r}"')
-        return self._header_regex
+        return get_header_regex(tuple(self.languages), self.default_language)
 
     @property
     def SIGNATURE_REGEX(self) -> Pattern:
-        if self._signature_regex: return self._signature_regex
-        sent_from_regex = [self._get_language_regex(language=language, regex_key='sent_from') for language in self.languages]
-        sent_from_regex = '|'.join([header for header in sent_from_regex if header])
-        signatures = [self._get_language_regex(language=language, regex_key='signatures') for language in self.languages]
-        signatures = '|'.join([header for header in signatures if header])
-
-        # Matches the following signatures – when a signature is matched it's considered to move all the way
-        # until the end of the mail body. Might be dangerous; but honestly how github/email_reply_parser works too
-        #   1) Outlook-style signatures
-        #   2) Idiot-filter phone email_reply_parser "Sent from my ..." (usually 1-3 words)
-        #   3) Get Outlook for... / Sent from Outlook for iOS<https://greed.com">
-        #   4) Regular signature-indicating stuff; e.g. "Best regards, ..."
-        # TODO: Add quotation as optional matching
-        self._signature_regex = re.compile(
-            fr'(({DEFAULT_SIGNATURE_REGEX}|{OUTLOOK_MAIL_SEPARATOR}|' +   # 1)
-            fr'\s*^{QUOTED_MATCH_INCLUDE}(?:{sent_from_regex}) ?(?:(?:[\w.<>:// ]+)|(?:\w+ ){1,3})$|'+  # 2) + 3)
-            fr'(?<!\A)^{QUOTED_MATCH_INCLUDE}(?:{signatures}))(.|\s)*)',  # 4)
-            flags=re.MULTILINE | re.IGNORECASE
-        )
-        logger.debug(f'Mail Signature RegEx: "{self._signature_regex.pattern!r}"')
-
-        # TODO: Always match whole signature until the next fragment/regex or until end of text
-        return self._signature_regex
+        return get_signature_regex(tuple(self.languages), self.default_language)
 
     def _normalize_text(self):
-        # Normalize Line Endings
-        self.text = self.text.replace("\r\n", "\n")
-        # Remove invisible characters and dead line-beginnings/-endings
-        self.text = '\n'.join([line.strip() for line in self.text.split('\n')])
-
+        # Remove invisible characters and dead line-beginnings/-endings; stripping each line
+        # also normalizes line endings, as it removes the "\r" left over from "\r\n"
+        #
         # Some users may reply directly above a line of underscores.
-        # In order to ensure that these fragments are split correctly, make sure that all lines
-        # of underscores are preceded by at least two newline characters.
+        # In order to ensure that these fragments are split correctly, a line of underscores following
+        # blank lines is folded onto the fragment above it; only what trails the underscores is kept.
         #   See email_2_2.txt for an example
-        self.text = re.sub(f'([^\n]){OUTLOOK_MAIL_SEPARATOR}', '\\1\n', self.text, re.MULTILINE)
-
-    def _process_signatures_disclaimers(self, text: str) -> Tuple[List[str], str]:
-        """ Identifies Signature Elements and Disclaimers """
-        disclaimers = self.DISCLAIMERS_REGEX.findall(text)
-        signatures = self.SIGNATURE_REGEX.search(text)
+        lines = []
+        # whether the last non-blank line ends in a character a separator may attach to; this mirrors
+        #  the non-overlapping `re.sub` this loop replaces, which consumed the separator characters
+        separable, blank_lines = False, 0
+        for line in self.text.split('\n'):
+            line = line.strip()
+            if not line:
+                blank_lines += 1
+                continue
+            if (separable and blank_lines and len(line) >= OUTLOOK_SEPARATOR_MIN_LENGTH
+                    and not line[:OUTLOOK_SEPARATOR_MIN_LENGTH].strip(OUTLOOK_SEPARATOR_CHARACTERS)):
+                line, blank_lines = line.lstrip(OUTLOOK_SEPARATOR_CHARACTERS), 0
+                separable = bool(line)
+            else:
+                separable = True
+            lines.extend([''] * blank_lines)
+            lines.append(line)
+            blank_lines = 0
+        lines.extend([''] * blank_lines)
+        self.text = '\n'.join(lines)
+
+    def _process_signatures_disclaimers(self, text: str, disclaimers_regex: Pattern, signature_regex: Pattern,
+                                        casefolded: Optional[str] = None) -> Tuple[List[str], str]:
+        """ Identifies Signature Elements and Disclaimers
+         casefolded - the casefolded text, if already at hand """
+        if not text or text.isspace(): return [], ''
+        # Regexes are costly to run; skip them if none of the literals they require occur in the text
+        if casefolded is None: casefolded = _casefold(text)
+        signature_keywords = get_signature_keywords(tuple(self.languages), self.default_language)
+        disclaimers = disclaimers_regex.findall(text) if DISCLAIMER_KEYWORD in casefolded else []
+        signatures = None
+        if signature_keywords is None or any(keyword in casefolded for keyword in signature_keywords):
+            signatures = signature_regex.search(text)
         return disclaimers, signatures.group() if signatures else ''
 
     def read(self):
         """ Processes mail text body, splitting it up in distinct, digestible EmailReplies
          based on headers separating mail replies/mail parts """
 
-        # Find all headers in mail body and convert to flat list
-        headers = self.HEADER_REGEX.findall(self.text)
-        headers = [header for header in chain.from_iterable(headers) if header]
+        # Find all headers in mail body; every non-empty group of a match counts as a header.
+        # Headers are costly to match; only look for those whose keywords occur in the mail at all
+        # (alternatives without keywords are always looked for)
+        header_regexes = [
+            regex for keywords, regex in get_header_regexes(tuple(self.languages), self.default_language)
+            if keywords is None or self._contains_any(keywords)
+        ]
+        headers = (
+            (match.start(group), match.group(group))
+            for match in _finditer_alternatives(header_regexes, self.text)
+            for group in range(1, match.re.groups + 1) if match.group(group)
+        )
+        disclaimers_regex, signature_regex = self.DISCLAIMERS_REGEX, self.SIGNATURE_REGEX
+        # Casefolding keeps offsets intact for ASCII only; otherwise every fragment is casefolded on its own
+        casefolded_text = self.casefolded_text if self.text.isascii() else None
 
         current_position = 0
         previous_header = ''
 
         # Delimits eMail body by headers
-        for header in headers:
-            position = self.text.find(
-                header,
-                current_position + 1 if current_position > 0 else current_position
-            )
-
-            disclaimers, signatures = self._process_signatures_disclaimers(self.text[current_position:position])
-
-            _reply = EmailReply(
-                headers=previous_header,
-                content=self.text[current_position:position],
-                signatures=signatures,
-                disclaimers=disclaimers
-            )
-            current_position = position if position >= 0 else 0
+        for position, header in headers:
+            content = self.text[current_position:position]
+            # Blank fragments (e.g. ahead of a leading header) are dropped; don't bother scanning them
+            if content and not content.isspace():
+                disclaimers, signatures = self._process_signatures_disclaimers(
+                    content, disclaimers_regex, signature_regex,
+                    casefolded_text[current_position:position] if casefolded_text else None
+                )
+                self.replies.append(EmailReply(
+                    headers=previous_header,
+                    content=content,
+                    signatures=signatures,
+                    disclaimers=disclaimers
+                ))
+            current_position = position
             previous_header = header
-            if not _reply.content: continue
-            self.replies.append(_reply)
 
         # Add last reply element that is otherwise skipped due to the way we're iterating over headers.
         # This also adds the message body as a whole, in case there are no email headers at all
-        disclaimers, signatures = self._process_signatures_disclaimers(self.text[current_position:])
+        disclaimers, signatures = self._process_signatures_disclaimers(
+            self.text[current_position:], disclaimers_regex, signature_regex,
+            casefolded_text[current_position:] if casefolded_text else None
+        )
         _reply = EmailReply(
             headers=previous_header,
             content=self.text[current_position:],
@@ -214,7 +418,7 @@ class EmailMessage:
         return self
 
 
-@dataclass
+@_slotted_dataclass
 class EmailReply:
     """ A reply is a standalone part of an Email Message, including headers, body, signatures and disclaimers """
 
@@ -228,6 +432,10 @@ class EmailReply:
     #: Disclaimers within text body
     disclaimers: Optional[List[str]] = field(default_factory=lambda: [])
 
+    # slots can't hold a cached_property; cache body/full_body manually
+    _body: Union[str, None] = field(default=None, init=False, repr=False, compare=False)
+    _full_body: Union[str, None] = field(default=None, init=False, repr=False, compare=False)
+
     def __post_init__(self):
         self.content = self.content.strip()
         self.headers = self.headers.strip()
@@ -243,14 +451,21 @@ class EmailReply:
     @property
     def body(self) -> str:
         """ Returns the message's body without the headers, signatures and disclaimers """
-        _body = self.content
-        for disclaimer in self.disclaimers:
-            _body = _body.replace(disclaimer, '')
-        if self.signatures:
-            _body = _body.replace(self.signatures, '')
-        return _body.replace(self.headers or '', '').strip()
+        if self._body is None:
+            # The signature runs until the end of the reply and often contains the disclaimers;
+            # remove it first, so a disclaimer removed before can't keep it from matching
+            _body = self.content
+            if self.signatures:
+                _body = _body.replace(self.signatures, '')
+            for disclaimer in self.disclaimers:
+                if disclaimer not in self.signatures:
+                    _body = _body.replace(disclaimer, '')
+            self._body = _body.replace(self.headers or '', '').strip()
+        return self._body
 
     @property
     def full_body(self) -> str:
         """ Returns the message's body without the headers, but with signatures and disclaimers """
-        return self.content.replace(self.headers or '', '').strip()
+        if self._full_body is None:
+            self._full_body = self.content.replace(self.headers or '', '').strip()
+        return self._full_body
@@ -1,60 +1,93 @@
-import os
 import sys
 import unittest
 import logging
+from functools import lru_cache
+from pathlib import Path
 
-base_path = os.path.realpath(os.path.dirname(__file__))
-root = os.path.join(base_path, '..')
-sys.path.append(root)
-from mailparser_reply import EmailReplyParser
+from mailparser_reply import EmailReplyParser, EmailMessage, precompile
+from mailparser_reply import parser
 from mailparser_reply.constants import MAIL_LANGUAGE_DEFAULT
 
 
+# Keep the parser's debug output (e.g. the compiled regexes) out of test runs, whatever the root logger is set to
+logging.getLogger('mailparser_reply').setLevel(logging.WARNING)
+
+
+#: Test mail name -> path; resolved once and independent of the working directory
+FIXTURE_PATHS = {path.stem: path for path in (Path(__file__).resolve().parent / 'emails').glob('*.txt')}
+
+
+@lru_cache(maxsize=None)
+def load_fixture(name: str) -> str:
+    """ Return the text of a test mail; every fixture is only read from disk once """
+    return FIXTURE_PATHS[name].read_text(encoding='utf-8')
+
+
+@lru_cache(maxsize=None)
+def parse_fixture(name: str, languages: tuple) -> EmailMessage:
+    """ Return the parsed test mail; tests only read the result, so it is shared between them """
+    return EmailReplyParser.for_languages(languages).read(load_fixture(name))
+
+
+#: Language combinations the tests parse fixtures with
+EN, EN_DE, EN_DE_DAVID = ('en',), ('en', 'de'), ('en', 'de', 'david')
+JA, NL, PL = ('ja',), ('nl',), ('pl',)
+LANGUAGE_SETS = (EN, EN_DE, EN_DE_DAVID, JA, NL, PL)
+#: Regex builders in mailparser_reply.parser whose lru_caches reading a mail is served from
+REGEX_CACHES = ('get_header_regexes', 'get_disclaimers_regex', 'get_signature_regex', 'get_signature_keywords')
+
+
+def setUpModule():
+    # Set up the shared parsers, compiling their regexes, before the first test runs
+    for languages in LANGUAGE_SETS:
+        EmailReplyParser.for_languages(languages)
+
+
 class EmailMessageTest(unittest.TestCase):
     def test_simple_body(self):
-        mail = self.get_email('email_1_1', parse=True, languages=['en'])
+        mail = self.get_email('email_1_1', parse=True, languages=EN)
         self.assertEqual(1, len(mail.replies))
-        self.assertTrue("riak-users" in mail.replies[0].content)
-        self.assertTrue("riak-users" in mail.replies[0].signatures)
-        self.assertTrue("riak-users" not in mail.replies[0].body)
+        self.assertIn("riak-users", mail.replies[0].content)
+        self.assertIn("riak-users", mail.replies[0].signatures)
+        self.assertNotIn("riak-users", mail.replies[0].body)
 
     def test_simple_quoted_body(self):
-        mail = self.get_email('email_1_3', parse=True, languages=['en'])
+        mail = self.get_email('email_1_3', parse=True, languages=EN)
         self.assertEqual(3, len(mail.replies))
-        self.assertTrue("On 01/03/11 7:07 PM, Russell Brown wrote:" in mail.replies[1].content)
-        self.assertTrue("On 01/03/11 7:07 PM, Russell Brown wrote:" not in mail.replies[1].body)
-        self.assertTrue("-Abhishek Kona" in mail.replies[0].signatures)
-        self.assertTrue("-Abhishek Kona" not in mail.replies[0].body)
+        self.assertIn("On 01/03/11 7:07 PM, Russell Brown wrote:", mail.replies[1].content)
+        self.assertNotIn("On 01/03/11 7:07 PM, Russell Brown wrote:", mail.replies[1].body)
+        self.assertIn("-Abhishek Kona", mail.replies[0].signatures)
+        self.assertNotIn("-Abhishek Kona", mail.replies[0].body)
 
         self.assertTrue("> Hi," == mail.replies[1].body)
         # test if matching quoted signatures works
-        self.assertTrue(">> -Abhishek Kona" in mail.replies[2].content)
-        self.assertTrue(">> -Abhishek Kona" in mail.replies[2].signatures)
-        self.assertTrue(">> -Abhishek Kona" not in mail.replies[2].body)
+        self.assertIn(">> -Abhishek Kona", mail.replies[2].content)
+        self.assertIn(">> -Abhishek Kona", mail.replies[2].signatures)
+        self.assertNotIn(">> -Abhishek Kona", mail.replies[2].body)
 
     def test_simple_scrambled_body(self):
-        mail = self.get_email('email_1_4', parse=True, languages=['en'])
+        mail = self.get_email('email_1_4', parse=True, languages=EN)
         self.assertEqual(2, len(mail.replies))
-        self.assertTrue("defunkt<reply@reply.github.com>" in mail.replies[1].content)
-        self.assertTrue("defunkt<reply@reply.github.com>" in mail.replies[1].headers)
+        self.assertIn("defunkt<reply@reply.github.com>", mail.replies[1].content)
+        self.assertIn("defunkt<reply@reply.github.com>", mail.replies[1].headers)
 
     def test_simple_longer_mail(self):
-        mail = self.get_email('email_1_5', parse=True, languages=['en', 'de', 'david'])
+        mail = self.get_email('email_1_5', parse=True, languages=EN_DE_DAVID)
         self.assertEqual(1, len(mail.replies))
-        self.assertTrue(len(mail.latest_reply.split('\n')) == 15)
+        self.assertEqual(15, mail.latest_reply.count('\n') + 1)
 
     def test_simple_scrambled_header(self):
-        mail = self.get_email('email_1_6', parse=True, languages=['en'])
+        mail = self.get_email('email_1_6', parse=True, languages=EN)
         self.assertEqual(2, len(mail.replies))
-        self.assertTrue("<reply@reply.github.com>" in mail.replies[1].headers)
+        self.assertIn("<reply@reply.github.com>", mail.replies[1].headers)
 
     def test_simple_scrambled_header2(self):
-        mail = self.get_email('email_1_7', parse=True, languages=['en'])
+        mail = self.get_email('email_1_7', parse=True, languages=EN)
         self.assertEqual(2, len(mail.replies))
-        self.assertTrue("<notifications@github.com>wrote:" in mail.replies[1].headers)
+        self.assertIn("<notifications@github.com>wrote:", mail.replies[1].headers)
 
     def test_simple_quoted_reply(self):
-        mail = self.get_email('email_1_8', parse=True, languages=['en'])
+        mail = self.get_email('email_1_8', parse=True, languages=EN)
         # TODO: Should this *actually* be the desired behaviour? tbh, nobody sends mails including this header tho
         #   Maybe otherwise: 1) Negative lookahead unquoted message
         #                    2) Unless message is disclaimer/signature (scan from behind)
@@ -62,29 +95,35 @@ class EmailMessageTest(unittest.TestCase):
         # self.assertTrue("--\nHey there, this is my signature" == mail.replies[1].signatures)
 
     def test_gmail_header(self):
-        mail = self.get_email('email_2_1', parse=True, languages=['en'])
+        mail = self.get_email('email_2_1', parse=True, languages=EN)
         self.assertEqual(2, len(mail.replies))
         self.assertTrue("Outlook with a reply\n\n\n------------------------------" == mail.replies[0].body)
-        self.assertTrue("Google Apps Sync Team [mailto:mail-noreply@google.com]" in mail.replies[1].headers)
-        self.assertTrue("Google Apps Sync Team [mailto:mail-noreply@google.com]" not in mail.replies[1].body)
+        self.assertIn("Google Apps Sync Team [mailto:mail-noreply@google.com]", mail.replies[1].headers)
+        self.assertNotIn("Google Apps Sync Team [mailto:mail-noreply@google.com]", mail.replies[1].body)
 
     def test_gmail_indented(self):
-        mail = self.get_email('email_2_3', parse=True, languages=['en'])
+        mail = self.get_email('email_2_3', parse=True, languages=EN)
         self.assertEqual(2, len(mail.replies))
         self.assertTrue("Outlook with a reply above headers using unusual format" == mail.replies[0].body)
         # _normalize_body flattens the lines
-        self.assertTrue("Ei tale aliquam eum, at vel tale sensibus, an sit vero magna. Vis no veri" in mail.replies[1].body)
+        self.assertIn("Ei tale aliquam eum, at vel tale sensibus, an sit vero magna. Vis no veri", mail.replies[1].body)
 
     def test_complex_mail_thread(self):
-        mail = self.get_email('email_3_1', parse=True, languages=['en', 'de', 'david'])
+        mail = self.get_email('email_3_1', parse=True, languages=EN_DE_DAVID)
         self.assertEqual(5, len(mail.replies))
 
+    def test_default_language_without_header_keywords(self):
+        # "david" has no wrote-header keywords to fall back to; its header alternatives are always looked for
+        text = self.get_email('email_3_1', parse=False)
+        mail = EmailMessage(text=text, languages=['en', 'david'], default_language='david').read()
+        self.assertEqual(4, len(mail.replies))
+
     def test_multiline_on(self):
-        mail = self.get_email('multiline_on', parse=True, languages=['en', 'de'])
+        mail = self.get_email('multiline_on', parse=True, languages=EN_DE)
         self.assertEqual(4, len(mail.replies))
 
     def test_header_no_delimiter(self):
-        mail = self.get_email('email_headers_no_delimiter', parse=True, languages=['en',])
+        mail = self.get_email('email_headers_no_delimiter', parse=True, languages=EN)
         self.assertEqual(3, len(mail.replies))
         self.assertTrue("And another reply!" == mail.replies[0].body)
         self.assertTrue("A reply" == mail.replies[1].body)
@@ -92,91 +131,161 @@ class EmailMessageTest(unittest.TestCase):
         self.assertTrue("This is a message.\nWith a second line." == mail.replies[2].body)
 
     def test_sent_from_junk1(self):
-        mail = self.get_email('email_sent_from_iPhone', parse=True, languages=['en'])
+        mail = self.get_email('email_sent_from_iPhone', parse=True, languages=EN)
         self.assertEqual(1, len(mail.replies))
         self.assertTrue("Here is another email" == mail.replies[0].body)
         self.assertTrue("Sent from my iPhone" == mail.replies[0].signatures)
 
     def test_sent_from_junk2(self):
-        mail = self.get_email('email_sent_from_multi_word_mobile_device', parse=True, languages=['en'])
+        mail = self.get_email('email_sent_from_multi_word_mobile_device', parse=True, languages=EN)
         self.assertEqual(1, len(mail.replies))
         self.assertTrue("Here is another email" == mail.replies[0].body)
         self.assertTrue("Sent from my Verizon Wireless BlackBerry" == mail.replies[0].signatures)
 
     def test_sent_from_junk3(self):
-        mail = self.get_email('email_sent_from_BlackBerry', parse=True, languages=['en'])
+        mail = self.get_email('email_sent_from_BlackBerry', parse=True, languages=EN)
         self.assertEqual(1, len(mail.replies))
         self.assertTrue("Here is another email" == mail.replies[0].body)
         self.assertTrue("Sent from my BlackBerry" == mail.replies[0].signatures)
 
     def test_sent_from_junk4(self):
-        mail = self.get_email('email_sent_from_not_signature', parse=True, languages=['en'])
+        mail = self.get_email('email_sent_from_not_signature', parse=True, languages=EN)
         self.assertEqual(1, len(mail.replies))
         self.assertTrue("Here is another email\n\nSent from my desk, is much easier than my mobile phone." == mail.replies[0].body)
         self.assertTrue("" == mail.replies[0].signatures)
 
     def test_ja_simple_body(self):
-        mail = self.get_email('email_ja_1_1', parse=True, languages=['ja'])
+        mail = self.get_email('email_ja_1_1', parse=True, languages=JA)
         self.assertEqual(1, len(mail.replies))
-        self.assertTrue("こんにちは" in mail.replies[0].body)
+        self.assertIn("こんにちは", mail.replies[0].body)
 
     def test_ja_simple_quoted_reply(self):
-        mail = self.get_email('email_ja_1_2', parse=True, languages=['ja'])
+        mail = self.get_email('email_ja_1_2', parse=True, languages=JA)
         self.assertEqual(2, len(mail.replies))
-        self.assertTrue("お世話になっております。織田です。" in mail.replies[0].body)
-        self.assertTrue("それでは 11:00 にお待ちしております。" in mail.replies[0].body)
-        self.assertTrue("かしこまりました" in mail.replies[1].body)
-        self.assertTrue("明日の 11:00 でお願いいたします" in mail.replies[1].body)
+        self.assertIn("お世話になっております。織田です。", mail.replies[0].body)
+        self.assertIn("それでは 11:00 にお待ちしております。", mail.replies[0].body)
+        self.assertIn("かしこまりました", mail.replies[1].body)
+        self.assertIn("明日の 11:00 でお願いいたします", mail.replies[1].body)
 
 
     # Dutch language
     def test_dutch_simple_body(self):
-        mail = self.get_email('email_nl_1_1', parse=True, languages=['nl'])
+        mail = self.get_email('email_nl_1_1', parse=True, languages=NL)
         self.assertEqual(1, len(mail.replies))
-        self.assertTrue("riak-gebruikers" in mail.replies[0].content)
-        self.assertTrue("riak-gebruikers" in mail.replies[0].signatures)
-        self.assertTrue("riak-gebruikers" not in mail.replies[0].body)
+        self.assertIn("riak-gebruikers", mail.replies[0].content)
+        self.assertIn("riak-gebruikers", mail.replies[0].signatures)
+        self.assertNotIn("riak-gebruikers", mail.replies[0].body)
 
     def test_dutch_gmail_header(self):
-        mail = self.get_email('email_nl_1_2', parse=True, languages=['nl'])
+        mail = self.get_email('email_nl_1_2', parse=True, languages=NL)
         self.assertEqual(2, len(mail.replies))
         self.assertTrue("Outlook met een antwoord\n\n\n------------------------------" == mail.replies[0].body)
-        self.assertTrue("Google Apps Sync Team [mailto:mail-noreply@google.com]" in mail.replies[1].headers)
-        self.assertTrue("Google Apps Sync Team [mailto:mail-noreply@google.com]" not in mail.replies[1].body)
+        self.assertIn("Google Apps Sync Team [mailto:mail-noreply@google.com]", mail.replies[1].headers)
+        self.assertNotIn("Google Apps Sync Team [mailto:mail-noreply@google.com]", mail.replies[1].body)
 
     def test_pl_simple_body(self):
-        mail = self.get_email('email_pl_1_1', parse=True, languages=['pl'])
+        mail = self.get_email('email_pl_1_1', parse=True, languages=PL)
         self.assertEqual(1, len(mail.replies))
-        self.assertTrue("Czesc Anno" in mail.replies[0].body)
-        self.assertTrue("Pozdrawiam,\nJan" in mail.replies[0].signatures)
-        self.assertTrue("Pozdrawiam,\nJan" not in mail.replies[0].body)
+        self.assertIn("Czesc Anno", mail.replies[0].body)
+        self.assertIn("Pozdrawiam,\nJan", mail.replies[0].signatures)
+        self.assertNotIn("Pozdrawiam,\nJan", mail.replies[0].body)
 
     def test_pl_simple_quoted_reply(self):
-        mail = self.get_email('email_pl_1_2', parse=True, languages=['pl'])
+        mail = self.get_email('email_pl_1_2', parse=True, languages=PL)
         self.assertEqual(2, len(mail.replies))
-        self.assertTrue("Dnia 28 lutego 2023 14:00 Anna Nowak <anna.nowak@example.com>" in mail.replies[1].content)
-        self.assertTrue("Dnia 28 lutego 2023 14:00 Anna Nowak <anna.nowak@example.com>" not in mail.replies[1].body)
-        self.assertTrue("> Pozdrawiam," in mail.replies[1].content)
-        self.assertTrue("> Pozdrawiam," in mail.replies[1].signatures)
-        self.assertTrue("> Pozdrawiam," not in mail.replies[1].body)
+        self.assertIn("Dnia 28 lutego 2023 14:00 Anna Nowak <anna.nowak@example.com>", mail.replies[1].content)
+        self.assertNotIn("Dnia 28 lutego 2023 14:00 Anna Nowak <anna.nowak@example.com>", mail.replies[1].body)
+        self.assertIn("> Pozdrawiam,", mail.replies[1].content)
+        self.assertIn("> Pozdrawiam,", mail.replies[1].signatures)
+        self.assertNotIn("> Pozdrawiam,", mail.replies[1].body)
 
     def test_pl_simple_signature(self):
-        mail = self.get_email('email_pl_1_3', parse=True, languages=['pl'])
+        mail = self.get_email('email_pl_1_3', parse=True, languages=PL)
+        self.assertEqual(1, len(mail.replies))
+        self.assertIn("Z powazaniem,\nJan", mail.replies[0].signatures)
+        self.assertNotIn("Z powazaniem,\nJan", mail.replies[0].body)
+
+    def test_signature_with_disclaimer(self):
+        mail = self.get_email('signature_with_disclaimer', parse=True, languages=EN)
         self.assertEqual(1, len(mail.replies))
-        self.assertTrue("Z powazaniem,\nJan" in mail.replies[0].signatures)
-        self.assertTrue("Z powazaniem,\nJan" not in mail.replies[0].body)
+        self.assertTrue(mail.replies[0].disclaimers[0].startswith("CAUTION: This email"))
+        self.assertIn(mail.replies[0].disclaimers[0], mail.replies[0].signatures)
+        self.assertTrue("Hi there,\n\nthe report is attached." == mail.replies[0].body)
+
+    def test_pathological_long_lines(self):
+        mail = self.get_email('pathological', parse=True, languages=EN)
+        self.assertEqual(2, len(mail.replies))
+        self.assertTrue(mail.replies[1].headers.startswith("On Dec 8, 2013 2:10 PM"))
+        # long lines starting like a header must not backtrack for ages
+        mail = EmailReplyParser(languages=['en', 'it', 'nl', 'pl']).read(('On ' + 'a b ' * 2000 + '\n') * 3)
+        self.assertEqual(1, len(mail.replies))
+
+    def test_precompile_default_language(self):
+        # The import-time precompile() must warm what reading with the default language uses
+        self.use_fresh_regex_caches()
+        precompile()
+        text = self.get_email('email_2_1', parse=False)
+        self.assertNoRegexCompiles(EmailMessage(text=text, languages=[MAIL_LANGUAGE_DEFAULT]).read)
+
+    def test_precompile(self):
+        self.use_fresh_regex_caches()
+        precompile(('pl', 'en'))
+        # Every header, disclaimer and signature kind occurs, so reading uses all the compiled regexes
+        text = '\n\n'.join([self.get_email(name, parse=False) for name in ('email_pl_1_2', 'email_2_1', 'caution')])
+        mail = self.assertNoRegexCompiles(EmailMessage(text=text + '\n\nSent from my iPhone', languages=['pl']).read)
+        self.assertTrue(len(mail.replies) > 1)
+
+    def test_shared_parser(self):
+        shared = EmailReplyParser.for_languages(('en', 'de'))
+        self.assertIs(shared, EmailReplyParser.for_languages(['en', 'de']))
+        self.assertIsNot(shared, EmailReplyParser.for_languages(('de', 'en')))
+        text = self.get_email('email_1_3', parse=False)
+        self.assertEqual(3, len(shared.read(text).replies))
+        self.assertEqual(3, len(shared.read(text).replies))
+
+    def test_read_many(self):
+        names = ['email_1_1', 'email_1_3', 'email_2_1', 'email_headers_no_delimiter']
+        mails = EmailReplyParser(languages=['en']).read_many(self.get_email(name, parse=False) for name in names)
+        self.assertEqual(len(names), len(mails))
+        for name, mail in zip(names, mails):
+            expected = self.get_email(name, parse=True, languages=EN)
+            self.assertEqual([reply.body for reply in expected.replies], [reply.body for reply in mail.replies])
+        mails = EmailReplyParser(languages=['en']).read_many(
+            [self.get_email(name, parse=False) for name in names], workers=2
+        )
+        self.assertEqual([[reply.body for reply in mail.replies] for mail in mails],
+                         [[reply.body for reply in self.get_email(name).replies] for name in names])
+
+    def test_read_many_worker_initializer(self):
+        # Spawned workers only have the caches read_many's initializer warms
+        reader = EmailReplyParser(languages=['de'])
+        self.use_fresh_regex_caches()
+        parser._precompile_reading(tuple(reader.languages))
+        self.assertNoRegexCompiles(reader.read, self.get_email('multiline_on_de', parse=False))
 
     def test_header_begins_w_signature(self):
-        mail = self.get_email('begins_with_signature', parse=True, languages=['en'])
+        mail = self.get_email('begins_with_signature', parse=True, languages=EN)
         self.assertTrue(mail.replies[0].signatures. startswith("Regards,"))
 
-    def get_email(self, name: str, parse: bool = True, languages: list = None):
+    def use_fresh_regex_caches(self):
+        """ Swaps empty regex caches into the parser for the rest of the test; the shared ones are restored after """
+        for name in REGEX_CACHES:
+            cache = getattr(parser, name)
+            self.addCleanup(setattr, parser, name, cache)
+            setattr(parser, name, lru_cache(maxsize=cache.cache_parameters()['maxsize'])(cache.__wrapped__))
+
+    def assertNoRegexCompiles(self, function, *args):
+        """ Calls the function and asserts it was served from the regex caches alone; returns its result """
+        caches = [getattr(parser, name) for name in REGEX_CACHES]
+        misses = [cache.cache_info().misses for cache in caches]
+        result = function(*args)
+        self.assertEqual(misses, [cache.cache_info().misses for cache in caches])
+        return result
+
+    def get_email(self, name: str, parse: bool = True, languages: tuple = None):
         """ Return EmailMessage instance or text content """
-        with open(f'test/emails/{name}.txt') as f:
-            text = f.read()
-        return EmailReplyParser(
-            languages=languages or [MAIL_LANGUAGE_DEFAULT]
-        ).read(text) if parse else text
+        if not parse: return load_fixture(name)
+        return parse_fixture(name, languages or (MAIL_LANGUAGE_DEFAULT,))
 
 
 if __name__ == '__main__':